@@ -1,43 +1,38 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, TypedDict
+from typing import Any, Dict, List, Optional, TypedDict
 
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
+from langgraph.types import Command, interrupt
 
+from src.agent.llm import get_node_llm
+from src.agent.prompts import get_prompt, preload_prompts
+from src.agent.scheduler import OverloadedError
 from src.config.settings import get_settings
 from src.tools.retriever import load_faiss_retriever
 from src.tools.mcp_client import mcp_get_customer_by_phone, mcp_get_policy_by_number
 
 
+# Answer given when synthesis is shed by the admission lane under load.
+OVERLOADED_ANSWER = ("We're handling a high volume of calls right now. Please hold for a moment, "
+                     "or try again shortly, and we'll help you with your question.")
+
+
 class AgentState(TypedDict, total=False):
     messages: List[dict]
     caller_profile: Dict[str, Any]
     plan: Dict[str, Any]
     retrieved: List[Dict[str, Any]]
     mcp: Dict[str, Any]
-    confirmed: bool
+    confirmed: Optional[bool]
     answer: str
 
 
-def _llm():
-    settings = get_settings()
-    return ChatOpenAI(model=settings.openai_model, temperature=0)
-
-
 def node_plan(state: AgentState) -> AgentState:
-    settings = get_settings()
-    planner = _llm()
-    with open("src/prompts/planner.txt", "r", encoding="utf-8") as f:
-        planner_text = f.read()
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", planner_text),
-        ("human", "Caller profile: {caller}\n\nConversation so far: {history}\n\nUser query: {query}\n\nRespond with JSON only."),
-    ])
+    planner = get_node_llm("plan")
+    prompt = get_prompt("planner")
     last_user = ""
     for m in reversed(state.get("messages", [])):
         if m.get("type") == "human":
@@ -45,13 +40,19 @@ def node_plan(state: AgentState) -> AgentState:
             break
     history = "\n".join([f"{m.get('type')}: {m.get('content')}" for m in state.get("messages", [])])
     chain = prompt | planner | StrOutputParser()
-    raw = chain.invoke({"caller": json.dumps(state.get("caller_profile", {})), "history": history, "query": last_user})
+    try:
+        raw = chain.invoke({"caller": json.dumps(state.get("caller_profile", {})), "history": history, "query": last_user})
+    except OverloadedError:
+        # Planning was shed under load; fall through to the default plan rather than failing the turn.
+        raw = ""
     plan = {}
     try:
         plan = json.loads(raw)
     except Exception:
         plan = {"steps": ["RETRIEVE_KNOWLEDGE", "DRAFT_ANSWER"]}
-    return {**state, "plan": plan}
+    # The checkpointer keeps the previous turn's results in the thread state; clear them so
+    # this turn only sees what its own nodes produce.
+    return {**state, "plan": plan, "retrieved": [], "mcp": {}, "confirmed": None, "answer": ""}
 
 
 def node_retrieve(state: AgentState) -> AgentState:
@@ -62,7 +63,12 @@ def node_retrieve(state: AgentState) -> AgentState:
         if m.get("type") == "human":
             last_user = m.get("content", "")
             break
-    docs = retriever.get_relevant_documents(last_user)
+    try:
+        # The query embedding is admitted through the embeddings lane (see ScheduledEmbeddings).
+        docs = retriever.get_relevant_documents(last_user)
+    except OverloadedError:
+        # Answer without knowledge-base context rather than fail the turn.
+        docs = []
     simple_docs = [{"content": d.page_content, "source": d.metadata.get("source")} for d in docs]
     return {**state, "retrieved": simple_docs}
 
@@ -87,10 +93,7 @@ def node_mongo_mcp(state: AgentState) -> AgentState:
 
 
 def node_summarize(state: AgentState) -> AgentState:
-    llm = _llm()
-    with open("src/prompts/system.txt", "r", encoding="utf-8") as f:
-        system_txt = f.read()
-    system = SystemMessage(content=system_txt)
+    llm = get_node_llm("synthesize")
     last_user = ""
     for m in reversed(state.get("messages", [])):
         if m.get("type") == "human":
@@ -102,34 +105,42 @@ def node_summarize(state: AgentState) -> AgentState:
         context_parts.append("Knowledge base excerpts:\n" + "\n---\n".join([d["content"][:1000] for d in retrieved]))
     if state.get("mcp"):
         context_parts.append("Caller data (MCP):\n" + json.dumps(state.get("mcp"), indent=2))
+    if state.get("confirmed") is False:
+        context_parts.append("A supervisor declined the planned sensitive action; do not perform it and explain that it needs follow-up.")
     context = "\n\n".join(context_parts) or "(no extra context)"
 
-    prompt = ChatPromptTemplate.from_messages([
-        system,
-        ("human", "Context to consider:\n{context}"),
-        ("human", "User: {query}"),
-        ("human", "Write a concise, accurate response. Cite policy text when relevant.")
-    ])
+    prompt = get_prompt("synthesizer")
     chain = prompt | llm | StrOutputParser()
-    final = chain.invoke({"context": context, "query": last_user})
+    try:
+        final = chain.invoke({"context": context, "query": last_user})
+    except OverloadedError:
+        # Synthesis was shed under load; ask the caller to hold instead of failing the turn.
+        final = OVERLOADED_ANSWER
     return {**state, "answer": final}
 
 
-def build_graph():
+def node_human(state: AgentState) -> AgentState:
+    """Pause the run for a supervisor decision when the plan contains HUMAN_CONFIRM.
+
+    The pause is a LangGraph interrupt persisted by the checkpointer, so no worker is held
+    while the decision is pending; `resume_confirmation` continues the thread.
+    """
+    needs = any((isinstance(s, dict) and s.get("action") == "HUMAN_CONFIRM") or s == "HUMAN_CONFIRM" for s in (state.get("plan") or {}).get("steps", []))
+    confirmed = True
+    if needs:
+        decision = interrupt({"question": "Proceed with the planned sensitive action?", "plan": state.get("plan", {})})
+        confirmed = bool(decision.get("approved")) if isinstance(decision, dict) else bool(decision)
+    return {**state, "confirmed": confirmed}
+
+
+def build_graph(checkpointer: Any = None):
+    preload_prompts()
     g = StateGraph(AgentState)
     g.add_node("plan", node_plan)
     g.add_node("retrieve", node_retrieve)
     g.add_node("mcp", node_mongo_mcp)
     g.add_node("synthesize", node_summarize)
     
-    # Optional human confirm node inline to keep it simple
-    def node_human(state: AgentState) -> AgentState:
-        from src.tools.human import human_confirm
-        needs = any((isinstance(s, dict) and s.get("action") == "HUMAN_CONFIRM") or s == "HUMAN_CONFIRM" for s in (state.get("plan") or {}).get("steps", []))
-        confirmed = True
-        if needs:
-            confirmed = human_confirm("Proceed with the planned sensitive action?", default=False)
-        return {**state, "confirmed": confirmed}
     g.add_node("human", node_human)
 
     g.set_entry_point("plan")
@@ -151,4 +162,29 @@ def build_graph():
     g.add_edge("human", "synthesize")
     g.add_edge("synthesize", END)
 
-    return g.compile()
+    return g.compile(checkpointer=checkpointer)
+
+
+def pending_confirmation(graph: Any, config: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Return the interrupt payload if the thread in `config` is waiting for confirmation."""
+    snapshot = graph.get_state(config)
+    for task in snapshot.tasks:
+        for intr in getattr(task, "interrupts", ()):
+            return intr.value
+    return None
+
+
+def list_pending_confirmations(graph: Any, checkpointer: Any) -> Dict[str, Dict[str, Any]]:
+    """Map thread_id -> interrupt payload for every thread awaiting confirmation."""
+    thread_ids = {cp.config["configurable"]["thread_id"] for cp in checkpointer.list(None)}
+    pending: Dict[str, Dict[str, Any]] = {}
+    for thread_id in sorted(thread_ids):
+        payload = pending_confirmation(graph, {"configurable": {"thread_id": thread_id}})
+        if payload is not None:
+            pending[thread_id] = payload
+    return pending
+
+
+def resume_confirmation(graph: Any, config: Dict[str, Any], approved: bool) -> AgentState:
+    """Resume a thread paused in the human node with the supervisor's decision."""
+    return graph.invoke(Command(resume={"approved": approved}), config=config)
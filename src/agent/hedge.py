@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, List, Optional, TypeVar
+
+from src.config.settings import get_settings
+
+T = TypeVar("T")
+
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _submit(fn: Callable[[], T]) -> Optional[Future]:
+    """Run `fn` on the hedge pool if a worker is free right now, else return None.
+
+    The pool never queues: a call waiting there would bypass the admission lane's
+    priority order, max wait and shedding.
+    """
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None or _slots is None:
+            size = get_settings().llm_hedge_pool_size
+            _pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="llm-hedge")
+            _slots = threading.BoundedSemaphore(size)
+        pool, slots = _pool, _slots
+    if not slots.acquire(blocking=False):
+        return None
+    future = pool.submit(contextvars.copy_context().run, fn)
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging delay."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            data = sorted(self._samples)
+        return data[min(len(data) - 1, int(len(data) * 0.95))]
+
+
+def hedged_call(primary: Callable[[Callable[[], None]], T], duplicate: Callable[[], T],
+                tracker: LatencyTracker, min_delay: float) -> T:
+    """Run `primary`; if it has not answered after the tracked p95 (at least `min_delay`),
+    start `duplicate` and return whichever succeeds first.
+
+    `primary` receives an `on_start` callback to call when its request actually begins
+    (after admission control); the hedge delay and the recorded latency run from that
+    point, so queueing never triggers a hedge. `duplicate` should fail fast instead of
+    queueing when there is no spare capacity, in which case the primary is awaited alone.
+    Only the primary's latency is recorded, so hedging does not pull its own delay down.
+
+    Calls run on a shared pool with a copy of the caller's context, so context-local
+    state (callbacks, scheduling priority) follows them. When the pool has no free
+    worker, the primary runs unhedged on the caller's thread (and a duplicate is
+    skipped), so queueing only ever happens in the admission lane. The losing call is
+    not interrupted; its result is discarded.
+    """
+    delay = max(min_delay, tracker.p95() or 0.0)
+    started = threading.Event()
+    start_times: List[float] = []
+
+    def on_start() -> None:
+        start_times.append(time.perf_counter())
+        started.set()
+
+    def run_primary() -> T:
+        try:
+            result = primary(on_start)
+        finally:
+            started.set()
+        if start_times:
+            tracker.record(time.perf_counter() - start_times[0])
+        return result
+
+    primary_future = _submit(run_primary)
+    if primary_future is None:
+        return run_primary()
+    futures: List[Future] = [primary_future]
+    started.wait()
+    done, _ = wait(futures, timeout=delay)
+    if not done:
+        duplicate_future = _submit(duplicate)
+        if duplicate_future is not None:
+            futures.append(duplicate_future)
+
+    error: Optional[BaseException] = None
+    remaining = set(futures)
+    while remaining:
+        done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                return fut.result()
+            if fut is futures[0]:
+                error = fut.exception()
+    # Only the primary's error is surfaced; a duplicate that could not be admitted is not a failure.
+    assert error is not None
+    raise error
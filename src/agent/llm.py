@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+import httpx
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_openai import ChatOpenAI
+
+from src.agent.hedge import LatencyTracker, hedged_call
+from src.agent.scheduler import Priority, chat_provider, get_lane
+from src.config.settings import get_settings
+
+
+_lock = threading.Lock()
+_models: Dict[str, ChatOpenAI] = {}
+_trackers: Dict[str, LatencyTracker] = {}
+
+_NODE_PRIORITY = {"plan": Priority.LIVE, "synthesize": Priority.SYNTHESIS}
+
+
+def get_chat_model(model: str | None = None) -> ChatOpenAI:
+    """Return the process-wide chat client for `model`, creating it on first use.
+
+    ChatOpenAI is thread-safe, so one instance per model is shared by all sessions and
+    nodes; its httpx client keeps connections alive between calls.
+    """
+    settings = get_settings()
+    name = model or settings.openai_model
+    with _lock:
+        llm = _models.get(name)
+        if llm is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_keepalive,
+                    keepalive_expiry=settings.llm_keepalive_expiry,
+                ),
+                timeout=max(settings.llm_timeout_plan, settings.llm_timeout_synthesize),
+            )
+            llm = ChatOpenAI(
+                model=name,
+                temperature=0,
+                base_url=settings.openai_base_url,
+                http_client=http_client,
+                max_retries=settings.llm_max_retries,
+                # A custom http_client turns off ChatOpenAI's default; without it streamed
+                # calls (eval, bench) report no token usage.
+                stream_usage=True,
+            )
+            _models[name] = llm
+        return llm
+
+
+def _node_timeout(node: str) -> float:
+    settings = get_settings()
+    timeouts = {"plan": settings.llm_timeout_plan, "synthesize": settings.llm_timeout_synthesize}
+    return timeouts.get(node, settings.llm_timeout_synthesize)
+
+
+def get_node_llm(node: str) -> Any:
+    """Chat model runnable for a graph node, with that node's request timeout.
+
+    Every call goes through the chat provider's admission lane (rate limit, concurrency cap,
+    priority: synthesis before planning before background work). With LLM_HEDGE_ENABLED,
+    calls are hedged: once an admitted call has run past the node's observed p95 latency, a
+    duplicate is sent if the lane has spare capacity, and the first answer wins.
+    """
+    settings = get_settings()
+    bound = get_chat_model().bind(timeout=_node_timeout(node))
+    lane = get_lane(chat_provider())
+    priority = _NODE_PRIORITY.get(node, Priority.LIVE)
+
+    def _scheduled(messages: Any, config: RunnableConfig) -> Any:
+        return lane.run(lambda: bound.invoke(messages, config=config), priority)
+
+    if not settings.llm_hedge_enabled:
+        return RunnableLambda(_scheduled, name=f"{node}_llm")
+
+    with _lock:
+        tracker = _trackers.setdefault(node, LatencyTracker(min_samples=settings.llm_hedge_min_samples))
+
+    def _hedged(messages: Any, config: RunnableConfig) -> Any:
+        # The primary queues for admission as usual and starts the hedge clock once admitted;
+        # the duplicate only runs if the lane has spare capacity right now, never queueing.
+        return hedged_call(
+            lambda on_start: lane.run(lambda: bound.invoke(messages, config=config), priority, on_admit=on_start),
+            lambda: lane.try_run(lambda: bound.invoke(messages, config=config), priority),
+            tracker,
+            settings.llm_hedge_min_delay,
+        )
+
+    return RunnableLambda(_hedged, name=f"hedged_{node}_llm")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 from typing import TypeAlias
 
@@ -20,7 +21,8 @@ def get_checkpointer(db_path: str | Path = ".checkpoints/state.db") -> Checkpoin
     if SqliteSaver is not None:
         path = Path(db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        return SqliteSaver.from_file(str(path))
+        # One connection shared across worker threads; SqliteSaver serializes access itself.
+        return SqliteSaver(sqlite3.connect(str(path), check_same_thread=False))
     if MemorySaver is not None:
         return MemorySaver()
     return None
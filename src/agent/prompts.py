@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+Builder = Callable[[str], ChatPromptTemplate]
+
+
+def _planner(text: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        ("system", text),
+        ("human", "Caller profile: {caller}\n\nConversation so far: {history}\n\nUser query: {query}\n\nRespond with JSON only."),
+    ])
+
+
+def _synthesizer(text: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=text),
+        ("human", "Context to consider:\n{context}"),
+        ("human", "User: {query}"),
+        ("human", "Write a concise, accurate response. Cite policy text when relevant."),
+    ])
+
+
+# Prompt name -> (file in src/prompts, template builder)
+PROMPTS: Dict[str, Tuple[str, Builder]] = {
+    "planner": ("planner.txt", _planner),
+    "synthesizer": ("system.txt", _synthesizer),
+}
+
+
+class PromptRegistry:
+    """Compiled prompt templates, read from the package's prompts directory.
+
+    Each template is built once and rebuilt only when its file's mtime changes, so
+    prompt edits are picked up without a restart and turns don't re-read the disk.
+    """
+
+    def __init__(self, directory: Path = PROMPTS_DIR, prompts: Dict[str, Tuple[str, Builder]] | None = None) -> None:
+        self.directory = directory
+        self.prompts = prompts if prompts is not None else PROMPTS
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[int, ChatPromptTemplate]] = {}
+
+    def get(self, name: str) -> ChatPromptTemplate:
+        filename, builder = self.prompts[name]
+        path = self.directory / filename
+        mtime = path.stat().st_mtime_ns
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, builder(path.read_text(encoding="utf-8")))
+                self._cache[name] = cached
+            return cached[1]
+
+    def preload(self) -> None:
+        for name in self.prompts:
+            self.get(name)
+
+
+_registry = PromptRegistry()
+
+
+def get_prompt(name: str) -> ChatPromptTemplate:
+    return _registry.get(name)
+
+
+def preload_prompts() -> None:
+    _registry.preload()
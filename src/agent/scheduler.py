@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from src.config.settings import get_settings
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    SYNTHESIS = 0   # live-call answer generation
+    LIVE = 1        # other live-call work: planning, retrieval
+    BACKGROUND = 2  # eval, indexing, batch summarization
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a model call is shed instead of queued (queue full or wait too long)."""
+
+
+_priority: ContextVar[Optional[Priority]] = ContextVar("model_call_priority", default=None)
+
+
+def current_priority() -> Optional[Priority]:
+    return _priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[None]:
+    """Run model calls made in this context (thread) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Consume a token and return 0, or return the seconds until one is available.
+
+        Not thread-safe on its own; callers hold the lane lock.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class ProviderLane:
+    """Admission control for one provider: rate limit, concurrency cap and a priority queue.
+
+    Waiting calls are admitted strictly in (priority, arrival) order. Background calls are
+    shed once the queue is half full, live calls once it is full, and any call that waits
+    longer than `max_wait` is shed rather than left to time out and retry.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int,
+                 max_queue: int, max_wait: float) -> None:
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(1, max_queue)
+        self.max_wait = max_wait
+        self._bucket = TokenBucket(rate, burst)
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self.stats: Dict[str, int] = {"admitted": 0, "shed": 0, "max_queue_depth": 0}
+
+    def _queue_limit(self, priority: Priority) -> int:
+        return max(1, self.max_queue // 2) if priority >= Priority.BACKGROUND else self.max_queue
+
+    def _shed(self, reason: str) -> OverloadedError:
+        self.stats["shed"] += 1
+        return OverloadedError(f"{self.name}: {reason}")
+
+    def _acquire(self, priority: Priority) -> None:
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            if len(self._queue) >= self._queue_limit(priority):
+                raise self._shed(f"queue full ({len(self._queue)} waiting), shedding {priority.name} call")
+            ticket = (int(priority), next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._queue))
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait_for = None
+                    if self._queue[0] == ticket and self._active < self.max_concurrency:
+                        wait_for = self._bucket.take(now)
+                        if wait_for == 0:
+                            heapq.heappop(self._queue)
+                            self._active += 1
+                            self.stats["admitted"] += 1
+                            self._cond.notify_all()
+                            return
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise self._shed(f"waited more than {self.max_wait:.1f}s, shedding {priority.name} call")
+                    self._cond.wait(min(wait_for, remaining) if wait_for else remaining)
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @staticmethod
+    def _effective(priority: Priority | None) -> Priority:
+        # A BACKGROUND priority_scope demotes the call; otherwise the given priority applies.
+        if current_priority() == Priority.BACKGROUND:
+            return Priority.BACKGROUND
+        return priority if priority is not None else Priority.LIVE
+
+    def run(self, fn: Callable[[], T], priority: Priority | None = None,
+            on_admit: Callable[[], None] | None = None) -> T:
+        """Run `fn` once admitted (`priority` defaults to LIVE). `on_admit` is called right
+        after admission, before `fn`, so callers can time the call without the queue wait."""
+        self._acquire(self._effective(priority))
+        try:
+            if on_admit is not None:
+                on_admit()
+            return fn()
+        finally:
+            self._release()
+
+    def try_run(self, fn: Callable[[], T], priority: Priority | None = None) -> T:
+        """Run `fn` only if it can be admitted right now: nothing queued, a free slot and a
+        token available. Otherwise raise OverloadedError without queueing (used for hedges,
+        which must never add to a backlog)."""
+        effective = self._effective(priority)
+        with self._cond:
+            if self._queue or self._active >= self.max_concurrency or self._bucket.take(time.monotonic()) != 0:
+                raise OverloadedError(f"{self.name}: no spare capacity for {effective.name} call")
+            self._active += 1
+            self.stats["admitted"] += 1
+        try:
+            return fn()
+        finally:
+            self._release()
+
+
+_lanes_lock = threading.Lock()
+_lanes: Dict[str, ProviderLane] = {}
+
+
+def chat_provider() -> str:
+    return "openai-chat"
+
+
+def embeddings_provider() -> str:
+    return f"{get_settings().embeddings_provider}-embeddings"
+
+
+def get_lane(provider: str) -> ProviderLane:
+    """Shared lane for `provider`; chat lanes use the LLM_* limits, embedding lanes EMBED_*."""
+    with _lanes_lock:
+        lane = _lanes.get(provider)
+        if lane is None:
+            s = get_settings()
+            if provider.endswith("-embeddings"):
+                rate, burst, concurrency = s.embed_rate_limit, s.embed_rate_burst, s.embed_max_concurrency
+            else:
+                rate, burst, concurrency = s.llm_rate_limit, s.llm_rate_burst, s.llm_max_concurrency
+            lane = ProviderLane(provider, rate, burst, concurrency, s.scheduler_max_queue, s.scheduler_max_wait)
+            _lanes[provider] = lane
+        return lane
+
+
+def scheduler_stats() -> Dict[str, Dict[str, int]]:
+    with _lanes_lock:
+        return {name: dict(lane.stats) for name, lane in _lanes.items()}
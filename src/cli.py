@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
+from typing import TYPE_CHECKING, Any, Dict, Optional, cast
 
 import typer
-from langchain_core.runnables import RunnableConfig
 from rich import print
 
-from src.agent.graph import AgentState, build_graph
-from src.agent.memory import get_checkpointer
-from src.index_docs import run_index
+# Heavy modules (langchain, langgraph, FAISS, pymongo) are imported inside the commands
+# that use them so that e.g. `seed-mongo` or `--help` start quickly.
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
+    from src.agent.graph import AgentState
 
 
 app = typer.Typer(add_completion=False)
@@ -32,43 +34,75 @@ def seed_mongo():
     seed()
 
 
+@app.command()
+def load_mongo(customers: Optional[Path] = typer.Option(None, exists=True, help="Customers .jsonl/.csv file"),
+               policies: Optional[Path] = typer.Option(None, exists=True, help="Policies .jsonl/.csv file"),
+               batch_size: int = typer.Option(1000, help="Upserts per bulk_write batch"),
+               workers: int = typer.Option(4, help="Batches written in parallel")):
+    """Bulk-load customers and policies into MongoDB (idempotent upserts; re-run to resume)."""
+    from src.mcp.load_mongo import load
+
+    if customers is None and policies is None:
+        print("[red]Pass --customers and/or --policies.[/]")
+        raise typer.Exit(1)
+    load(customers=customers, policies=policies, batch_size=batch_size, workers=workers)
+
+
 @app.command()
 def index(docs: str = typer.Option("src/data/docs", help="Docs directory"),
           out: str = typer.Option("data/faiss", help="FAISS index output directory")):
+    from src.index_docs import run_index
+
     docs_path = Path(docs)
     out_path = Path(out)
     run_index(docs_path, out_path)
 
 
+def _thread_config(session_id: str) -> RunnableConfig:
+    return cast("RunnableConfig", {"configurable": {"thread_id": session_id}})
+
+
+def _print_pending(session_id: str, pending: Dict[str, Any]) -> None:
+    print(f"[bold yellow]Awaiting supervisor confirmation:[/] {pending.get('question')}")
+    print(f"Resume with: python -m src.cli resume --session-id {session_id} --approve|--deny")
+
+
 @app.command()
 def chat(caller_profile: Optional[Path] = typer.Option(None, exists=True),
          session_id: str = typer.Option("default-session"),
          query: Optional[str] = typer.Option(None, help="Single-turn query; if omitted, enters interactive mode.")):
     """Chat with the agent. Uses FAISS + MCP + prompts + memory."""
-    graph = build_graph()
+    from src.agent.graph import build_graph, pending_confirmation, resume_confirmation
+    from src.agent.memory import get_checkpointer
+    from src.tools.human import human_confirm
+
     checkpointer = get_checkpointer()
+    graph = build_graph(checkpointer)
+    graph_config = _thread_config(session_id)
 
     caller: Dict[str, Any] = {}
     if caller_profile:
         caller = json.loads(Path(caller_profile).read_text(encoding="utf-8"))
 
-    def run_once(user_text: str) -> None:
+    def run_once(user_text: str, interactive: bool) -> None:
         state: AgentState = {
             "messages": [{"type": "human", "content": user_text}],
             "caller_profile": caller,
         }
-        graph_config: RunnableConfig = {"configurable": {"thread_id": session_id}}
-        if checkpointer is not None:
-            extended_config: Dict[str, Any] = dict(graph_config)
-            extended_config["checkpointer"] = checkpointer
-            graph_config = cast(RunnableConfig, extended_config)
-        result = cast(AgentState, graph.invoke(state, config=graph_config))
+        result = cast("AgentState", graph.invoke(state, config=graph_config))
+        pending = pending_confirmation(graph, graph_config)
+        if pending is not None:
+            if not interactive:
+                _print_pending(session_id, pending)
+                return
+            approved = human_confirm(str(pending.get("question")), default=False)
+            result = resume_confirmation(graph, graph_config, approved)
         print("\n[bold green]Agent:[/]\n" + result.get("answer", "(no answer)"))
 
     if query:
         print(f"[bold cyan]Caller Profile:[/] {caller}")
         print(f"[bold cyan]User:[/] {query}")
-        run_once(query)
+        run_once(query, interactive=False)
         raise typer.Exit(0)
 
     print("[bold cyan]Interactive chat. Type 'exit' to quit.[/]")
@@ -76,14 +110,109 @@ def chat(caller_profile: Optional[Path] = typer.Option(None, exists=True),
         user = input("You: ")
         if user.strip().lower() in {"exit", "quit"}:
             break
-        run_once(user)
+        run_once(user, interactive=True)
 
 
 @app.command()
-def eval():
+def pending():
+    """List sessions waiting for a supervisor confirmation."""
+    from src.agent.graph import build_graph, list_pending_confirmations
+    from src.agent.memory import get_checkpointer
+
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        print("[red]No checkpointer available; install langgraph checkpoint support.[/]")
+        raise typer.Exit(1)
+    graph = build_graph(checkpointer)
+    waiting = list_pending_confirmations(graph, checkpointer)
+    if not waiting:
+        print("No pending confirmations.")
+        return
+    for thread_id, payload in waiting.items():
+        print(f"[bold cyan]{thread_id}[/]: {payload.get('question')}\n  plan: {json.dumps(payload.get('plan', {}))}")
+
+
+@app.command()
+def resume(session_id: str = typer.Option(..., help="Session (thread) waiting for confirmation"),
+           approve: bool = typer.Option(..., "--approve/--deny", help="Supervisor decision")):
+    """Resume a session paused for human confirmation with the supervisor's decision."""
+    from src.agent.graph import build_graph, pending_confirmation, resume_confirmation
+    from src.agent.memory import get_checkpointer
+
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        print("[red]No checkpointer available; install langgraph checkpoint support.[/]")
+        raise typer.Exit(1)
+    graph = build_graph(checkpointer)
+    graph_config = _thread_config(session_id)
+    if pending_confirmation(graph, graph_config) is None:
+        print(f"[red]Session {session_id} has no pending confirmation.[/]")
+        raise typer.Exit(1)
+    result = resume_confirmation(graph, graph_config, approve)
+    print("\n[bold green]Agent:[/]\n" + result.get("answer", "(no answer)"))
+
+
+@app.command()
+def eval(workers: int = typer.Option(4, help="Scenarios run concurrently"),
+         scenarios: str = typer.Option("src/eval/scenarios.yaml", help="Scenario file"),
+         out: str = typer.Option("eval-results.json", help="JSON report output path"),
+         baseline: Optional[Path] = typer.Option(None, exists=True, help="Previous report to gate against"),
+         min_score: float = typer.Option(0.0, help="Fail if the mean score is below this"),
+         max_score_drop: float = typer.Option(0.05, help="Allowed score drop vs. baseline"),
+         latency_tolerance: float = typer.Option(0.25, help="Allowed latency increase ratio vs. baseline"),
+         max_errors: int = typer.Option(0, help="Fail if more scenarios than this raise an error")):
     from src.eval.run_eval import run_eval
     print("[bold cyan]Running evaluation scenarios...[/]")
-    run_eval()
+    failures = run_eval(workers=workers, scenarios_path=scenarios, out=out, baseline=baseline,
+                        min_score=min_score, max_score_drop=max_score_drop,
+                        latency_tolerance=latency_tolerance, max_errors=max_errors)
+    if failures:
+        print("[bold red]Evaluation gate failed:[/]")
+        for f in failures:
+            print(f"- {f}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def bench(callers: int = typer.Option(20, help="Number of simulated callers (conversations)"),
+          concurrency: int = typer.Option(8, help="Maximum callers served at once"),
+          rate: float = typer.Option(2.0, help="Caller arrival rate per second (0 = all at once)"),
+          turns: int = typer.Option(3, help="Turns per conversation"),
+          synthetic_ratio: float = typer.Option(0.5, help="Share of callers with a synthetic profile"),
+          seed: int = typer.Option(0),
+          scenarios: str = typer.Option("src/eval/scenarios.yaml", help="Scenario file"),
+          out: str = typer.Option("bench-results.json", help="JSON report output path"),
+          baseline: Optional[Path] = typer.Option(None, exists=True, help="Previous report to compare against"),
+          tolerance: float = typer.Option(0.2, help="Allowed regression ratio vs. baseline")):
+    """Load-test the agent with concurrent multi-turn callers."""
+    from src.eval.bench import run_bench
+    print("[bold cyan]Running load benchmark...[/]")
+    regressions = run_bench(callers=callers, concurrency=concurrency, rate=rate, turns=turns,
+                            synthetic_ratio=synthetic_ratio, seed=seed, scenarios_path=scenarios,
+                            out=out, baseline=baseline, tolerance=tolerance)
+    if regressions:
+        print("[bold red]Performance regressions vs. baseline:[/]")
+        for r in regressions:
+            print(f"- {r}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def import_times(command: Optional[str] = typer.Option(None, help="Single command to measure (default: all)"),
+                 repeat: int = typer.Option(3, help="Cold starts per command; the fastest is reported")):
+    """Measure cold import time of the CLI and of each command's lazy imports."""
+    from src.eval.startup import COMMAND_IMPORTS, measure_import_times
+
+    if command is not None and command not in COMMAND_IMPORTS:
+        print(f"[red]Unknown command {command!r}; choose from {', '.join(COMMAND_IMPORTS)}[/]")
+        raise typer.Exit(1)
+    results = measure_import_times([command] if command else None, repeat=repeat)
+    for name, r in results.items():
+        if r.get("error"):
+            print(f"{name:<12} [red]failed:[/] {r['error']}")
+        else:
+            total = r["cli_s"] + r["command_s"]
+            print(f"{name:<12} cli={r['cli_s'] * 1000:7.1f}ms  command={r['command_s'] * 1000:7.1f}ms  total={total * 1000:7.1f}ms")
 
 
 if __name__ == "__main__":
@@ -13,6 +13,30 @@ class Settings(BaseModel):
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     openai_embed_model: str = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
+    openai_base_url: str | None = os.getenv("OPENAI_BASE_URL")
+
+    # Shared chat client: connection pool, per-node timeouts (seconds) and optional hedging
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    llm_max_keepalive: int = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+    llm_keepalive_expiry: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    llm_timeout_plan: float = float(os.getenv("LLM_TIMEOUT_PLAN", "15"))
+    llm_timeout_synthesize: float = float(os.getenv("LLM_TIMEOUT_SYNTHESIZE", "30"))
+    llm_hedge_enabled: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() in {"1", "true", "yes"}
+    llm_hedge_min_delay: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+    llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    llm_hedge_pool_size: int = int(os.getenv("LLM_HEDGE_POOL_SIZE", "64"))
+
+    # Admission control for model calls: requests/second, burst and concurrency per provider
+    llm_rate_limit: float = float(os.getenv("LLM_RATE_LIMIT", "10"))
+    llm_rate_burst: float = float(os.getenv("LLM_RATE_BURST", "20"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    embed_rate_limit: float = float(os.getenv("EMBED_RATE_LIMIT", "20"))
+    embed_rate_burst: float = float(os.getenv("EMBED_RATE_BURST", "40"))
+    embed_max_concurrency: int = int(os.getenv("EMBED_MAX_CONCURRENCY", "8"))
+    embed_batch_size: int = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # texts per admitted embedding request
+    scheduler_max_queue: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "200"))
+    scheduler_max_wait: float = float(os.getenv("SCHEDULER_MAX_WAIT", "10"))
 
     embeddings_provider: str = os.getenv("EMBEDDINGS_PROVIDER", "openai")  # openai | ollama
 
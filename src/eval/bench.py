@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import random
+import resource
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from src.agent.graph import build_graph
+from src.agent.memory import get_checkpointer
+from src.agent.scheduler import scheduler_stats
+from src.eval.metrics import TurnTiming, compare_metrics, latency_summary, node_summaries, timed_invoke
+
+
+SYNTHETIC_NAMES = ["Morgan Lee", "Sam Okafor", "Priya Shah", "Chris Novak", "Dana Kim", "Luis Ortega"]
+
+FOLLOW_UPS = [
+    "Can you explain that in simpler terms?",
+    "Does that apply to rental cars too?",
+    "What documents do I need to provide?",
+    "How long does the claim review usually take?",
+    "Is there anything else I should know about my coverage?",
+]
+
+# Metrics compared against a baseline report: latency-style metrics regress upwards,
+# throughput regresses downwards.
+HIGHER_IS_WORSE = [
+    "latency_s.p50", "latency_s.p95", "latency_s.p99",
+    "queue_wait_s.p95", "first_response_s.p95", "first_response_s.p99",
+    "ttft_s.p50", "ttft_s.p95",
+    "memory.rss_growth_mb",
+]
+LOWER_IS_WORSE = ["throughput.turns_per_s"]
+
+
+@dataclass
+class CallerScript:
+    caller_id: str
+    caller_profile: Dict[str, Any]
+    turns: List[str]
+
+
+@dataclass
+class CallerResult:
+    caller_id: str
+    timings: List[TurnTiming] = field(default_factory=list)
+    error: Optional[str] = None
+    # Measured from the caller's scheduled arrival, so time spent waiting for a free worker
+    # is counted (no coordinated omission).
+    queue_wait_s: float = 0.0
+    first_response_s: Optional[float] = None
+    conversation_s: float = 0.0
+
+
+def _synthetic_profile(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "name": rng.choice(SYNTHETIC_NAMES),
+        "phone": f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "policy_number": f"PC-{rng.randint(100000, 999999)}",
+    }
+
+
+def build_scripts(scenarios: List[Dict[str, Any]], callers: int, turns: int,
+                  synthetic_ratio: float, seed: int) -> List[CallerScript]:
+    """Build one multi-turn conversation per simulated caller.
+
+    Each caller starts from a scenario (round-robin). Scenarios may list their own
+    `turns`; otherwise the scenario `query` is followed by random follow-ups. A share of
+    callers get a synthetic profile instead of the scenario's own.
+    """
+    rng = random.Random(seed)
+    scripts: List[CallerScript] = []
+    for i in range(callers):
+        scenario = scenarios[i % len(scenarios)]
+        conversation = list(scenario.get("turns") or [scenario.get("query", "")])
+        while len(conversation) < turns:
+            conversation.append(rng.choice(FOLLOW_UPS))
+        profile = dict(scenario.get("caller_profile", {}))
+        if rng.random() < synthetic_ratio:
+            profile = _synthetic_profile(rng)
+        scripts.append(CallerScript(f"bench-{seed}-{i}-{scenario.get('name')}", profile, conversation[:turns]))
+    return scripts
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _run_caller(graph: Any, run_id: str, script: CallerScript) -> CallerResult:
+    result = CallerResult(script.caller_id)
+    config: Dict[str, Any] = {"configurable": {"thread_id": f"{run_id}-{script.caller_id}"}}
+    history: List[Dict[str, Any]] = []
+    for text in script.turns:
+        messages = history + [{"type": "human", "content": text}]
+        state = {"messages": messages, "caller_profile": script.caller_profile}
+        try:
+            timing = timed_invoke(graph, state, config, auto_approve=True)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            break
+        result.timings.append(timing)
+        history = messages + [{"type": "ai", "content": timing.answer}]
+    return result
+
+
+def build_report(results: List[CallerResult], duration_s: float, rss_start: float, rss_end: float,
+                 settings: Dict[str, Any]) -> Dict[str, Any]:
+    timings = [t for r in results for t in r.timings]
+    errors = [{"caller": r.caller_id, "error": r.error} for r in results if r.error]
+    return {
+        "settings": settings,
+        "duration_s": duration_s,
+        "conversations": len(results),
+        "turns": len(timings),
+        "errors": errors,
+        "throughput": {
+            "turns_per_s": len(timings) / duration_s if duration_s > 0 else 0.0,
+            "conversations_per_s": len(results) / duration_s if duration_s > 0 else 0.0,
+        },
+        "queue_wait_s": latency_summary(r.queue_wait_s for r in results),
+        "first_response_s": latency_summary(r.first_response_s for r in results if r.first_response_s is not None),
+        "conversation_s": latency_summary(r.conversation_s for r in results if not r.error),
+        "latency_s": latency_summary(t.total_s for t in timings),
+        "ttft_s": latency_summary(t.ttft_s or t.total_s for t in timings),
+        "nodes_s": node_summaries(timings),
+        "scheduler": scheduler_stats(),
+        "memory": {
+            "rss_peak_start_mb": rss_start,
+            "rss_peak_end_mb": rss_end,
+            "rss_growth_mb": rss_end - rss_start,
+        },
+    }
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    nodes = set(current.get("nodes_s", {})) & set(baseline.get("nodes_s", {}))
+    higher = HIGHER_IS_WORSE + [f"nodes_s.{n}.p95" for n in sorted(nodes)]
+    return compare_metrics(current, baseline, higher, LOWER_IS_WORSE, tolerance)
+
+
+def run_bench(callers: int = 20, concurrency: int = 8, rate: float = 2.0, turns: int = 3,
+              synthetic_ratio: float = 0.5, seed: int = 0,
+              scenarios_path: str | Path = "src/eval/scenarios.yaml",
+              out: str | Path = "bench-results.json", baseline: str | Path | None = None,
+              tolerance: float = 0.2) -> List[str]:
+    """Simulate concurrent callers against the compiled graph and write a JSON report.
+
+    Callers arrive as a Poisson process at `rate` per second (0 starts them all at once)
+    and are served by at most `concurrency` workers. Returns the list of regressions
+    against `baseline`, if one is given.
+    """
+    scenarios = yaml.safe_load(Path(scenarios_path).read_text(encoding="utf-8"))
+    scripts = build_scripts(scenarios, callers, turns, synthetic_ratio, seed)
+    graph = build_graph(get_checkpointer(".checkpoints/bench.db"))
+    rng = random.Random(seed)
+    # bench.db outlives the run, so thread ids carry a per-run prefix.
+    run_id = uuid.uuid4().hex[:8]
+
+    results: List[CallerResult] = []
+    lock = threading.Lock()
+
+    def worker(script: CallerScript, arrived: float) -> None:
+        picked_up = time.perf_counter()
+        r = _run_caller(graph, run_id, script)
+        r.queue_wait_s = picked_up - arrived
+        if r.timings:
+            r.first_response_s = r.queue_wait_s + r.timings[0].total_s
+        r.conversation_s = time.perf_counter() - arrived
+        with lock:
+            results.append(r)
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for script in scripts:
+            if rate > 0:
+                time.sleep(rng.expovariate(rate))
+            pool.submit(worker, script, time.perf_counter())
+    duration = time.perf_counter() - start
+
+    settings = {"callers": callers, "concurrency": concurrency, "rate": rate, "turns": turns,
+                "synthetic_ratio": synthetic_ratio, "seed": seed, "scenarios": str(scenarios_path)}
+    report = build_report(results, duration, rss_start, _rss_mb(), settings)
+
+    regressions: List[str] = []
+    if baseline is not None:
+        base = json.loads(Path(baseline).read_text(encoding="utf-8"))
+        regressions = compare_reports(report, base, tolerance)
+        report["baseline"] = {"path": str(baseline), "tolerance": tolerance, "regressions": regressions}
+
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    lat = report["latency_s"]
+    first = report["first_response_s"]
+    print(f"{report['turns']} turns / {report['conversations']} conversations in {duration:.1f}s "
+          f"({report['throughput']['turns_per_s']:.2f} turns/s), {len(report['errors'])} errors")
+    print(f"latency p50={lat['p50']:.2f}s p95={lat['p95']:.2f}s p99={lat['p99']:.2f}s, "
+          f"ttft p95={report['ttft_s']['p95']:.2f}s, rss growth={report['memory']['rss_growth_mb']:.1f}MB")
+    print(f"from arrival: queue wait p95={report['queue_wait_s']['p95']:.2f}s, "
+          f"first answer p95={first['p95']:.2f}s p99={first['p99']:.2f}s")
+    for node, summary in report["nodes_s"].items():
+        print(f"  {node}: p50={summary['p50']:.2f}s p95={summary['p95']:.2f}s")
+    print(f"Report written to {out_path}")
+    return regressions
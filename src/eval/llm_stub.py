@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import typer
+
+
+app = typer.Typer(add_completion=False)
+
+STUB_PLAN = {"steps": ["RETRIEVE_KNOWLEDGE", "DRAFT_ANSWER"]}
+STUB_ANSWER = ("Your comprehensive deductible is listed in your policy, and claims should be filed "
+               "within the days stated after an accident.")
+STUB_EMBED_DIM = 16
+
+
+class StubConfig:
+    """Latency profile of the stub: every response waits `base_delay`, and a fraction
+    `slow_rate` of them waits `slow_delay` instead, to mimic provider tail latency."""
+
+    def __init__(self, base_delay: float, slow_rate: float, slow_delay: float, seed: int) -> None:
+        self.base_delay = base_delay
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def next_delay(self) -> float:
+        with self._lock:
+            self.requests += 1
+            slow = self._rng.random() < self.slow_rate
+        return self.slow_delay if slow else self.base_delay
+
+
+def _reply_text(messages: List[Dict[str, Any]]) -> str:
+    last = str(messages[-1].get("content", "")) if messages else ""
+    return json.dumps(STUB_PLAN) if "JSON only" in last else STUB_ANSWER
+
+
+def _embedding(item: Any) -> List[float]:
+    """Fixed vector derived from the input (text or token ids), so identical inputs match."""
+    digest = hashlib.sha256(json.dumps(item).encode("utf-8")).digest()
+    return [b / 255.0 for b in digest[:STUB_EMBED_DIM]]
+
+
+def _embeddings_payload(request: Dict[str, Any]) -> Dict[str, Any]:
+    inputs = request.get("input", [])
+    # A single string, or a single list of token ids, is one input.
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    data = []
+    for i, item in enumerate(inputs):
+        vector: Any = _embedding(item)
+        if request.get("encoding_format") == "base64":
+            vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+        data.append({"object": "embedding", "index": i, "embedding": vector})
+    return {"object": "list", "data": data, "model": request.get("model", "stub"),
+            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)}}
+
+
+def make_handler(config: StubConfig) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so client connection reuse is observable
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def setup(self) -> None:
+            super().setup()
+            config.count_connection()
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            return
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+            length = int(self.headers.get("Content-Length", "0"))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path.rstrip("/").endswith("/embeddings"):
+                # Fixed vectors, no injected delay: the stub exists to exercise chat latency.
+                self._send(200, json.dumps(_embeddings_payload(request)).encode("utf-8"), "application/json")
+                return
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, b'{"error": "not found"}', "application/json")
+                return
+
+            time.sleep(config.next_delay())
+            text = _reply_text(request.get("messages", []))
+            model = request.get("model", "stub")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            created = int(time.time())
+            usage = {"prompt_tokens": 10, "completion_tokens": len(text.split()), "total_tokens": 10 + len(text.split())}
+
+            if request.get("stream"):
+                chunks = [{"role": "assistant", "content": ""}] + [{"content": w + " "} for w in text.split(" ")]
+                events = []
+                for i, delta in enumerate(chunks):
+                    events.append({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                                   "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                    if i == len(chunks) - 1:
+                        events.append({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                                       "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    events.append({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                                   "model": model, "choices": [], "usage": usage})
+                body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+                self._send(200, body.encode("utf-8"), "text/event-stream")
+                return
+
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+            self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    return Handler
+
+
+def serve(host: str, port: int, config: StubConfig) -> ThreadingHTTPServer:
+    """Start the stub in a background thread and return the server (call `shutdown()` to stop).
+
+    Pass port 0 to pick a free port; read it back from `server.server_address`. `config`
+    counts requests and TCP connections, so callers can check connection reuse.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@app.command()
+def main(host: str = typer.Option("127.0.0.1"),
+         port: int = typer.Option(8089),
+         base_delay: float = typer.Option(0.2, help="Normal response delay (s)"),
+         slow_rate: float = typer.Option(0.05, help="Fraction of responses that are slow"),
+         slow_delay: float = typer.Option(3.0, help="Slow response delay (s)"),
+         seed: int = typer.Option(0)):
+    """Run an OpenAI-compatible chat completions stub that injects slow responses.
+
+    It also answers /embeddings with fixed vectors, so indexing and retrieval can use it.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(StubConfig(base_delay, slow_rate, slow_delay, seed)))
+    print(f"LLM stub listening on http://{host}:{port}/v1 (slow {slow_rate:.0%} @ {slow_delay}s)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    app()
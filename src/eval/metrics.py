@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+
+@dataclass
+class TurnTiming:
+    answer: str = ""
+    total_s: float = 0.0
+    ttft_s: Optional[float] = None
+    nodes: Dict[str, float] = field(default_factory=dict)
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    data = sorted(values)
+    if not data:
+        return 0.0
+    rank = (len(data) - 1) * pct / 100.0
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    if lo == hi:
+        return data[int(rank)]
+    return data[lo] + (data[hi] - data[lo]) * (rank - lo)
+
+
+def latency_summary(values: Iterable[float]) -> Dict[str, float]:
+    data = list(values)
+    if not data:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(data),
+        "mean": sum(data) / len(data),
+        "p50": percentile(data, 50),
+        "p95": percentile(data, 95),
+        "p99": percentile(data, 99),
+        "max": max(data),
+    }
+
+
+def timed_invoke(graph: Any, state: Any, config: Dict[str, Any], auto_approve: Optional[bool] = None) -> TurnTiming:
+    """Run one graph turn, recording per-node latency and time-to-first-token.
+
+    Nodes run sequentially, so the gap between two consecutive "updates" events is the
+    duration of the node that produced the later one. TTFT is taken from the first
+    streamed token of the synthesize node; models that do not stream fall back to the
+    end-to-end latency. If the run pauses for human confirmation and `auto_approve` is
+    set, it is resumed immediately with that decision, as a simulated supervisor.
+    """
+    timing = TurnTiming()
+    start = time.perf_counter()
+    payload: Any = state
+    while True:
+        mark = time.perf_counter()
+        interrupted = False
+        for mode, chunk in graph.stream(payload, config=config, stream_mode=["updates", "messages"]):
+            now = time.perf_counter()
+            if mode == "messages":
+                message, metadata = chunk
+                if (timing.ttft_s is None and metadata.get("langgraph_node") == "synthesize"
+                        and getattr(message, "content", "")):
+                    timing.ttft_s = now - start
+                continue
+            for node, update in (chunk or {}).items():
+                if node == "__interrupt__":
+                    interrupted = True
+                    continue
+                timing.nodes[node] = timing.nodes.get(node, 0.0) + (now - mark)
+                if isinstance(update, dict):
+                    timing.state = update
+            mark = now
+        if not interrupted or auto_approve is None:
+            break
+        from langgraph.types import Command
+
+        payload = Command(resume={"approved": auto_approve})
+    timing.total_s = time.perf_counter() - start
+    if timing.ttft_s is None:
+        timing.ttft_s = timing.total_s
+    timing.answer = str(timing.state.get("answer", ""))
+    return timing
+
+
+def node_summaries(timings: Iterable[TurnTiming]) -> Dict[str, Dict[str, float]]:
+    per_node: Dict[str, List[float]] = {}
+    for t in timings:
+        for node, seconds in t.nodes.items():
+            per_node.setdefault(node, []).append(seconds)
+    return {node: latency_summary(values) for node, values in sorted(per_node.items())}
+
+
+def _lookup(report: Dict[str, Any], path: str) -> Optional[float]:
+    node: Any = report
+    for key in path.split("."):
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return float(node) if isinstance(node, (int, float)) else None
+
+
+def compare_metrics(current: Dict[str, Any], baseline: Dict[str, Any], higher_is_worse: List[str],
+                    lower_is_worse: List[str], tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed by more than `tolerance` (a ratio)."""
+    regressions: List[str] = []
+    for path in higher_is_worse:
+        cur, base = _lookup(current, path), _lookup(baseline, path)
+        if cur is None or base is None or base <= 0:
+            continue
+        if cur > base * (1 + tolerance):
+            regressions.append(f"{path}: {cur:.4f} > baseline {base:.4f} (+{(cur / base - 1) * 100:.1f}%)")
+    for path in lower_is_worse:
+        cur, base = _lookup(current, path), _lookup(baseline, path)
+        if cur is None or base is None or base <= 0:
+            continue
+        if cur < base * (1 - tolerance):
+            regressions.append(f"{path}: {cur:.4f} < baseline {base:.4f} (-{(1 - cur / base) * 100:.1f}%)")
+    return regressions
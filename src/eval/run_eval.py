@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import yaml
 
 from src.agent.graph import build_graph
 from src.agent.memory import get_checkpointer
+from src.agent.scheduler import Priority, priority_scope, scheduler_stats
+from src.eval.metrics import TurnTiming, compare_metrics, latency_summary, node_summaries, timed_invoke
+
+try:
+    from langchain_community.callbacks import get_openai_callback
+except Exception:  # pragma: no cover - optional dependency
+    get_openai_callback = None  # type: ignore
 
 
 def keyword_score(text: str, keywords: List[str]) -> float:
@@ -16,26 +26,144 @@ def keyword_score(text: str, keywords: List[str]) -> float:
     return hits / max(1, len(keywords))
 
 
-def run_eval():
-    scenarios = yaml.safe_load(Path("src/eval/scenarios.yaml").read_text(encoding="utf-8"))
-    graph = build_graph()
-    checkpointer = get_checkpointer(".checkpoints/eval.db")
-
-    results: List[Dict] = []
-    for s in scenarios:
-        name = s.get("name")
-        caller = s.get("caller_profile", {})
-        query = s.get("query", "")
-        expected = s.get("expect_keywords", [])
-        state = {
-            "messages": [{"type": "human", "content": query}],
-            "caller_profile": caller,
-        }
-        out = graph.invoke(state, config={"configurable": {"thread_id": f"eval-{name}"}, "checkpointer": checkpointer})
-        answer = out.get("answer", "")
-        score = keyword_score(answer, expected)
-        results.append({"name": name, "score": score, "answer": answer})
+def _usage(cb: Any) -> Dict[str, Any]:
+    if cb is None:
+        return {}
+    return {
+        "prompt_tokens": cb.prompt_tokens,
+        "completion_tokens": cb.completion_tokens,
+        "total_tokens": cb.total_tokens,
+        "cached_prompt_tokens": getattr(cb, "prompt_tokens_cached", 0),
+        "cost_usd": cb.total_cost,
+    }
+
+
+def run_scenario(graph: Any, run_id: str, index: int, scenario: Dict[str, Any]) -> Dict[str, Any]:
+    name = scenario.get("name")
+    query = scenario.get("query", "")
+    state = {
+        "messages": [{"type": "human", "content": query}],
+        "caller_profile": scenario.get("caller_profile", {}),
+    }
+    config: Dict[str, Any] = {"configurable": {"thread_id": f"eval-{run_id}-{index}-{name}"}}
+
+    result: Dict[str, Any] = {"name": name, "score": 0.0, "answer": ""}
+    start = time.perf_counter()
+    timing = TurnTiming()
+    # Eval traffic yields to live calls in the model-call scheduler.
+    with priority_scope(Priority.BACKGROUND):
+        try:
+            if get_openai_callback is not None:
+                with get_openai_callback() as cb:
+                    timing = timed_invoke(graph, state, config, auto_approve=True)
+                result["usage"] = _usage(cb)
+            else:
+                timing = timed_invoke(graph, state, config, auto_approve=True)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            timing.total_s = time.perf_counter() - start
+
+    result["answer"] = timing.answer
+    result["score"] = keyword_score(timing.answer, scenario.get("expect_keywords", []))
+    result["latency_s"] = timing.total_s
+    result["ttft_s"] = timing.ttft_s
+    result["nodes_s"] = timing.nodes
+    result["_timing"] = timing
+    return result
+
+
+def summarize(results: List[Dict[str, Any]], duration_s: float, workers: int) -> Dict[str, Any]:
+    # Errored scenarios would skew the percentiles (often fast failures); they are counted in "errors".
+    timings: List[TurnTiming] = [r["_timing"] for r in results if not r.get("error")]
+    usage: Dict[str, float] = {}
+    for r in results:
+        for key, value in r.get("usage", {}).items():
+            usage[key] = usage.get(key, 0) + value
+    prompt_tokens = usage.get("prompt_tokens", 0)
+    return {
+        "scenarios": len(results),
+        "workers": workers,
+        "duration_s": duration_s,
+        "errors": sum(1 for r in results if r.get("error")),
+        "mean_score": sum(r["score"] for r in results) / max(1, len(results)),
+        "latency_s": latency_summary(t.total_s for t in timings),
+        "ttft_s": latency_summary(t.ttft_s or t.total_s for t in timings),
+        "nodes_s": node_summaries(timings),
+        "usage": usage,
+        "scheduler": scheduler_stats(),
+        "cache": {
+            "cached_prompt_tokens": usage.get("cached_prompt_tokens", 0),
+            "prompt_cache_hit_ratio": usage.get("cached_prompt_tokens", 0) / prompt_tokens if prompt_tokens else 0.0,
+        },
+    }
+
+
+def check_regressions(report: Dict[str, Any], baseline: Dict[str, Any] | None, min_score: float,
+                      max_score_drop: float, latency_tolerance: float, max_errors: int = 0) -> List[str]:
+    """Quality and latency gates: error count and minimum score, plus score drops and latency growth vs. baseline."""
+    failures: List[str] = []
+    summary = report["summary"]
+    if summary["errors"] > max_errors:
+        failures.append(f"{summary['errors']} scenarios errored (allowed {max_errors})")
+    if summary["mean_score"] < min_score:
+        failures.append(f"mean_score {summary['mean_score']:.3f} below minimum {min_score:.3f}")
+    if baseline is None:
+        return failures
 
+    base_summary = baseline.get("summary", {})
+    base_score = base_summary.get("mean_score")
+    if base_score is not None and summary["mean_score"] < base_score - max_score_drop:
+        failures.append(f"mean_score {summary['mean_score']:.3f} dropped from baseline {base_score:.3f}")
+    base_scores = {r.get("name"): r.get("score", 0.0) for r in baseline.get("results", [])}
+    for r in report["results"]:
+        prev = base_scores.get(r["name"])
+        if prev is not None and r["score"] < prev - max_score_drop:
+            failures.append(f"{r['name']}: score {r['score']:.2f} dropped from baseline {prev:.2f}")
+
+    nodes = set(summary["nodes_s"]) & set(base_summary.get("nodes_s", {}))
+    latency_paths = ["latency_s.p50", "latency_s.p95", "ttft_s.p95"] + [f"nodes_s.{n}.p95" for n in sorted(nodes)]
+    failures.extend(compare_metrics(summary, base_summary, latency_paths, [], latency_tolerance))
+    return failures
+
+
+def run_eval(workers: int = 4, scenarios_path: str | Path = "src/eval/scenarios.yaml",
+             out: str | Path = "eval-results.json", baseline: str | Path | None = None,
+             min_score: float = 0.0, max_score_drop: float = 0.05,
+             latency_tolerance: float = 0.25, max_errors: int = 0) -> List[str]:
+    """Run all scenarios on a bounded worker pool and write a JSON report.
+
+    Returns the list of gate failures (empty when the run passes).
+    """
+    scenarios = yaml.safe_load(Path(scenarios_path).read_text(encoding="utf-8"))
+    graph = build_graph(get_checkpointer(".checkpoints/eval.db"))
+
+    # Fresh thread ids per run so no scenario inherits checkpointed state from an earlier run.
+    run_id = uuid.uuid4().hex[:8]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda item: run_scenario(graph, run_id, *item), enumerate(scenarios)))
+    duration = time.perf_counter() - start
+
+    report: Dict[str, Any] = {"summary": summarize(results, duration, workers)}
     for r in results:
-        print(f"- {r['name']}: score={r['score']:.2f}\n{r['answer'][:400]}\n")
+        r.pop("_timing", None)
+    report["results"] = results
+
+    base = json.loads(Path(baseline).read_text(encoding="utf-8")) if baseline is not None else None
+    failures = check_regressions(report, base, min_score, max_score_drop, latency_tolerance, max_errors)
+    report["gate"] = {"baseline": str(baseline) if baseline else None, "failures": failures}
 
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for r in results:
+        suffix = f" error={r['error']}" if r.get("error") else ""
+        print(f"- {r['name']}: score={r['score']:.2f} latency={r['latency_s']:.2f}s{suffix}\n{r['answer'][:400]}\n")
+    summary = report["summary"]
+    print(f"mean_score={summary['mean_score']:.2f} p95={summary['latency_s']['p95']:.2f}s "
+          f"tokens={summary['usage'].get('total_tokens', 0)} errors={summary['errors']} "
+          f"in {duration:.1f}s with {workers} workers")
+    print(f"Report written to {out_path}")
+    return failures
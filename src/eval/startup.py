@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Modules each CLI command imports lazily on top of `src.cli` itself.
+COMMAND_IMPORTS: Dict[str, List[str]] = {
+    "--help": [],
+    "serve-mcp": ["src.mcp.mongo_server"],
+    "seed-mongo": ["src.mcp.seed_mongo"],
+    "load-mongo": ["src.mcp.load_mongo"],
+    "index": ["src.index_docs"],
+    "chat": ["src.agent.graph", "src.agent.memory", "src.tools.human"],
+    "pending": ["src.agent.graph", "src.agent.memory"],
+    "resume": ["src.agent.graph", "src.agent.memory"],
+    "eval": ["src.eval.run_eval"],
+    "bench": ["src.eval.bench"],
+}
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import src.cli
+t1 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+t2 = time.perf_counter()
+print(json.dumps({{"cli_s": t1 - t0, "command_s": t2 - t1}}))
+"""
+
+
+def measure_command(modules: List[str]) -> Dict[str, Any]:
+    """Import `src.cli` plus `modules` in a fresh interpreter and time both steps."""
+    proc = subprocess.run([sys.executable, "-c", _PROBE.format(modules=modules)],
+                          capture_output=True, text=True, check=False)
+    if proc.returncode != 0:
+        last = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return {"cli_s": None, "command_s": None, "error": last}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure_import_times(commands: List[str] | None = None, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Best-of-`repeat` cold import time per command (seconds), so slow imports show up per command."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for command in commands or list(COMMAND_IMPORTS):
+        samples = [measure_command(COMMAND_IMPORTS[command]) for _ in range(max(1, repeat))]
+        failed = [s for s in samples if s.get("error")]
+        results[command] = failed[0] if failed else min(samples, key=lambda s: s["cli_s"] + s["command_s"])
+    return results
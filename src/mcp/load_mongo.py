@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set
+
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import get_settings
+
+
+# Natural key per collection: upserts match on it, so re-running a load is idempotent.
+KEYS = {"customers": "phone", "policies": "policy_number"}
+# Lookup indexes that upserts don't need; built once the data is in.
+SECONDARY_INDEXES = {"customers": ["policy_number"], "policies": ["type"]}
+# Identifiers stay strings in every collection (customers.policy_number must match policies.policy_number).
+IDENTIFIER_FIELDS = set(KEYS.values())
+
+DUPLICATE_KEY = 11000
+
+
+def _coerce(value: str) -> Any:
+    """CSV cells are strings; turn plain numbers back into numbers (keeping e.g. leading zeros)."""
+    if value == "":
+        return None
+    for cast in (int, float):
+        try:
+            parsed = cast(value)
+        except ValueError:
+            continue
+        if str(parsed) == value and math.isfinite(parsed):
+            return parsed
+    return value
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream records from a .jsonl/.ndjson or .csv file without loading it into memory."""
+    suffix = path.suffix.lower()
+    with path.open("r", encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            for row in csv.DictReader(f):
+                yield {k: (v if k in IDENTIFIER_FIELDS else _coerce(v)) for k, v in row.items() if k}
+        elif suffix in {".jsonl", ".ndjson"}:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported file type {path.suffix!r}; use .jsonl, .ndjson or .csv")
+
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.skipped = 0
+        self.upserted = 0
+        self.modified = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"rows": self.rows, "skipped": self.skipped, "upserted": self.upserted,
+                "modified": self.modified, "errors": self.errors,
+                "seconds": round(self.elapsed, 2), "rows_per_s": round(self.rate, 1)}
+
+
+def _write_batch(collection: Any, ops: List[UpdateOne]) -> Dict[str, int]:
+    """Unordered bulk upsert. Duplicate-key errors come from two batches racing to insert the
+    same key; the row exists by then, so those ops are simply retried once as updates."""
+    try:
+        result = collection.bulk_write(ops, ordered=False)
+        return {"upserted": result.upserted_count, "modified": result.modified_count, "errors": 0}
+    except BulkWriteError as e:
+        details = e.details
+        retry = [ops[err["index"]] for err in details.get("writeErrors", []) if err.get("code") == DUPLICATE_KEY]
+        errors = len(details.get("writeErrors", [])) - len(retry)
+        modified = details.get("nModified", 0)
+        if retry:
+            try:
+                modified += collection.bulk_write(retry, ordered=False).modified_count
+            except BulkWriteError as retry_error:
+                errors += len(retry_error.details.get("writeErrors", []))
+        return {"upserted": details.get("nUpserted", 0), "modified": modified, "errors": errors}
+
+
+def load_collection(db: Any, name: str, path: Path, batch_size: int = 1000, workers: int = 4,
+                    progress_every: float = 5.0) -> LoadStats:
+    """Upsert every record of `path` into collection `name` using parallel unordered bulk writes."""
+    key = KEYS[name]
+    collection = db[name]
+    # The key index is needed up front: each upsert looks its row up by key.
+    collection.create_index(key, unique=True)
+
+    stats = LoadStats()
+    last_report = time.perf_counter()
+    inflight: Set[Future] = set()
+
+    def collect(done: Set[Future]) -> None:
+        for fut in done:
+            counts = fut.result()
+            stats.upserted += counts["upserted"]
+            stats.modified += counts["modified"]
+            stats.errors += counts["errors"]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        ops: List[UpdateOne] = []
+        for record in iter_records(path):
+            if record.get(key) in (None, ""):
+                stats.skipped += 1
+                continue
+            record.pop("_id", None)
+            ops.append(UpdateOne({key: record[key]}, {"$set": record}, upsert=True))
+            stats.rows += 1
+            if len(ops) >= batch_size:
+                # Bound in-flight batches so memory stays flat on large files.
+                if len(inflight) >= workers * 2:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                inflight.add(pool.submit(_write_batch, collection, ops))
+                ops = []
+            if time.perf_counter() - last_report >= progress_every:
+                last_report = time.perf_counter()
+                print(f"  {name}: {stats.rows} rows read, {stats.rate:.0f} rows/s")
+        if ops:
+            inflight.add(pool.submit(_write_batch, collection, ops))
+        done, _ = wait(inflight)
+        collect(done)
+
+    for field in SECONDARY_INDEXES.get(name, []):
+        collection.create_index(field)
+    return stats
+
+
+def load(customers: Path | None = None, policies: Path | None = None, batch_size: int = 1000,
+         workers: int = 4) -> Dict[str, Dict[str, Any]]:
+    s = get_settings()
+    client = MongoClient(s.mongodb_uri, maxPoolSize=max(10, workers * 2))
+    try:
+        db = client[s.mongodb_db]
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, path in (("customers", customers), ("policies", policies)):
+            if path is None:
+                continue
+            print(f"Loading {name} from {path} (batch={batch_size}, workers={workers})")
+            stats = load_collection(db, name, Path(path), batch_size=batch_size, workers=workers)
+            results[name] = stats.as_dict()
+            print(f"Loaded {name}: {json.dumps(results[name])}")
+        return results
+    finally:
+        client.close()
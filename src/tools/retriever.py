@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
+from langchain_core.embeddings import Embeddings
+
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_community.vectorstores import FAISS
@@ -17,19 +19,44 @@ try:
 except Exception:  # pragma: no cover
     OllamaEmbeddings = None  # type: ignore
 
+from src.agent.scheduler import Priority, embeddings_provider, get_lane
 from src.config.settings import get_settings
 
 
+class ScheduledEmbeddings(Embeddings):
+    """Embeddings whose provider calls go through the embeddings admission lane.
+
+    Documents are embedded in batches of `batch_size`, each admitted separately at
+    BACKGROUND priority, so indexing takes one token and slot per request and live
+    query embeddings (LIVE) can be admitted between batches.
+    """
+
+    def __init__(self, inner: Embeddings, batch_size: int) -> None:
+        self.inner = inner
+        self.batch_size = max(1, batch_size)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        lane = get_lane(embeddings_provider())
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            vectors.extend(lane.run(lambda: self.inner.embed_documents(batch), Priority.BACKGROUND))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return get_lane(embeddings_provider()).run(lambda: self.inner.embed_query(text), Priority.LIVE)
+
+
 def _get_embeddings():
     settings = get_settings()
     if settings.embeddings_provider == "openai":
         if OpenAIEmbeddings is None:
             raise RuntimeError("OpenAI embeddings not available. Install langchain-openai.")
-        return OpenAIEmbeddings(model=settings.openai_embed_model)
+        return ScheduledEmbeddings(OpenAIEmbeddings(model=settings.openai_embed_model), settings.embed_batch_size)
     elif settings.embeddings_provider == "ollama":
         if OllamaEmbeddings is None:
             raise RuntimeError("Ollama embeddings not available. Install langchain-community.")
-        return OllamaEmbeddings(model="nomic-embed-text")
+        return ScheduledEmbeddings(OllamaEmbeddings(model="nomic-embed-text"), settings.embed_batch_size)
     else:
         raise ValueError(f"Unknown EMBEDDINGS_PROVIDER: {settings.embeddings_provider}")
 
@@ -6,7 +6,7 @@ from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
 import streamlit as st
 from langchain_core.runnables import RunnableConfig
 
-from src.agent.graph import AgentState, build_graph
+from src.agent.graph import AgentState, build_graph, pending_confirmation, resume_confirmation
 from src.agent.memory import get_checkpointer
 from src.config.settings import get_settings
 
@@ -15,8 +15,8 @@ st.set_page_config(page_title="Call Center Agent Demo", layout="wide")
 
 @st.cache_resource(show_spinner=False)
 def load_agent() -> Tuple[Any, Any]:
-    graph = build_graph()
     checkpointer = get_checkpointer()
+    graph = build_graph(checkpointer)
     return graph, checkpointer
 
 
@@ -26,8 +26,6 @@ settings = get_settings()
 
 def build_config(session_id: str) -> RunnableConfig:
     config: Dict[str, Any] = {"configurable": {"thread_id": session_id}}
-    if checkpointer is not None:
-        config["checkpointer"] = checkpointer
     return cast(RunnableConfig, config)
 
 
@@ -66,6 +64,14 @@ def describe_mcp(result: Dict[str, Any]) -> str:
         return str(result)
 
 
+def resolve_confirmation(approved: bool) -> None:
+    result = resume_confirmation(graph, build_config(st.session_state.session_id), approved)
+    answer = result.get("answer")
+    if answer:
+        st.session_state.chat_messages.append({"role": "assistant", "content": str(answer)})
+        st.session_state.agent_messages = st.session_state.agent_messages + [{"type": "ai", "content": str(answer)}]
+
+
 def reset_conversation() -> None:
     st.session_state.chat_messages = []
     st.session_state.agent_messages = []
@@ -170,6 +176,10 @@ if prompt:
                     mcp_placeholder.markdown(describe_mcp(update.get("mcp") or {}))
                     log_lines.append("MCP lookup complete.")
 
+                if "__interrupt__" in update:
+                    status_placeholder.warning("Waiting for supervisor confirmation.")
+                    log_lines.append("Paused for human confirmation; approve or deny below.")
+
                 if "confirmed" in update:
                     confirmed = bool(update.get("confirmed"))
                     log_lines.append("Human confirmation granted." if confirmed else "Human confirmation denied.")
@@ -200,3 +210,13 @@ if prompt:
                 st.session_state.chat_messages.append({"role": "assistant", "content": final_answer})
                 history.append({"type": "ai", "content": final_answer})
             st.session_state.agent_messages = history
+
+
+pending = pending_confirmation(graph, build_config(st.session_state.session_id)) if checkpointer is not None else None
+if pending:
+    with st.container(border=True):
+        st.warning(f"Supervisor confirmation required: {pending.get('question')}")
+        st.json(pending.get("plan", {}))
+        approve_col, deny_col = st.columns(2)
+        approve_col.button("Approve", on_click=resolve_confirmation, args=(True,), use_container_width=True)
+        deny_col.button("Deny", on_click=resolve_confirmation, args=(False,), use_container_width=True)
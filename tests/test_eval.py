@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.agent import hedge, scheduler
+from src.config.settings import Settings
+from src.eval.llm_stub import StubConfig, serve
+
+
+@pytest.fixture
+def stub_agent(monkeypatch):
+    """Point the shared chat client at a fast local stub and stub out the FAISS retriever."""
+    pytest.importorskip("langchain_openai")
+    from src.agent import graph, llm
+
+    server = serve("127.0.0.1", 0, StubConfig(base_delay=0.0, slow_rate=0.0, slow_delay=0.0, seed=0))
+    settings = Settings(openai_api_key="test", openai_base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+                        llm_hedge_enabled=False, llm_rate_limit=0, llm_max_retries=0)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    for module in (llm, hedge, scheduler):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(llm, "_models", {})
+    monkeypatch.setattr(scheduler, "_lanes", {})
+    monkeypatch.setattr(graph, "load_faiss_retriever",
+                        lambda *args, **kwargs: type("Retriever", (), {"get_relevant_documents": lambda self, q: []})())
+    yield settings
+    server.shutdown()
+    server.server_close()
+
+
+def test_eval_reports_token_usage_for_streamed_calls(stub_agent, tmp_path, monkeypatch):
+    from src.eval import run_eval
+
+    if run_eval.get_openai_callback is None:
+        pytest.skip("langchain_community callbacks not available")
+    scenarios = tmp_path / "scenarios.yaml"
+    scenarios.write_text('- name: deductible\n  query: "What is my deductible?"\n'
+                         '  expect_keywords: [deductible]\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    failures = run_eval.run_eval(workers=1, scenarios_path=scenarios, out=tmp_path / "report.json")
+
+    summary = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["summary"]
+    assert failures == []
+    # eval streams every model call; usage must still be reported for those streams.
+    assert summary["usage"]["prompt_tokens"] > 0
+    assert summary["usage"]["total_tokens"] > 0
+
+
+def test_stub_serves_embeddings():
+    openai = pytest.importorskip("openai")
+    server = serve("127.0.0.1", 0, StubConfig(base_delay=0.0, slow_rate=0.0, slow_delay=0.0, seed=0))
+    try:
+        client = openai.OpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+        default = client.embeddings.create(model="stub", input=["deductible", "claim"])
+        floats = client.embeddings.create(model="stub", input="deductible", encoding_format="float")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(default.data) == 2
+    assert default.data[0].embedding == pytest.approx(floats.data[0].embedding)
+
+
+def _report(mean_score=0.8, errors=0, p95=1.0, scores=None, nodes=None):
+    latency = {"count": 2, "mean": p95, "p50": p95 / 2, "p95": p95, "p99": p95, "max": p95}
+    summary = {"errors": errors, "mean_score": mean_score, "latency_s": latency, "ttft_s": latency,
+               "nodes_s": {name: {"p95": value} for name, value in (nodes or {}).items()}}
+    results = [{"name": name, "score": score} for name, score in (scores or {"a": 0.8}).items()]
+    return {"summary": summary, "results": results}
+
+
+def _gate(report, baseline=None, **overrides):
+    from src.eval.run_eval import check_regressions
+
+    options = {"min_score": 0.0, "max_score_drop": 0.05, "latency_tolerance": 0.25, "max_errors": 0}
+    options.update(overrides)
+    return check_regressions(report, baseline, **options)
+
+
+def test_gate_passes_a_clean_run_without_baseline():
+    assert _gate(_report()) == []
+
+
+def test_gate_fails_on_errors_above_the_limit():
+    assert len(_gate(_report(errors=1))) == 1
+    assert _gate(_report(errors=1), max_errors=1) == []
+
+
+def test_gate_fails_below_minimum_score():
+    failures = _gate(_report(mean_score=0.4), min_score=0.5)
+    assert len(failures) == 1 and "below minimum" in failures[0]
+
+
+def test_gate_flags_score_drops_against_baseline():
+    baseline = _report(mean_score=0.9, scores={"a": 1.0, "b": 0.8})
+    current = _report(mean_score=0.8, scores={"a": 0.5, "b": 0.8})
+
+    failures = _gate(current, baseline)
+
+    assert any("dropped from baseline 0.900" in f for f in failures)
+    assert any(f.startswith("a: score 0.50") for f in failures)
+    assert not any(f.startswith("b:") for f in failures)
+    assert _gate(current, baseline, max_score_drop=0.6) == []
+
+
+def test_gate_flags_latency_growth_past_tolerance():
+    baseline = _report(p95=1.0, nodes={"plan": 0.5, "synthesize": 0.5})
+
+    assert _gate(_report(p95=1.2, nodes={"plan": 0.6, "synthesize": 0.5}), baseline) == []
+    failures = _gate(_report(p95=1.5, nodes={"plan": 0.5, "synthesize": 1.0}), baseline)
+    assert any(f.startswith("latency_s.p95") for f in failures)
+    assert any(f.startswith("ttft_s.p95") for f in failures)
+    assert any(f.startswith("nodes_s.synthesize.p95") for f in failures)
+    assert not any(f.startswith("nodes_s.plan") for f in failures)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.agent import graph
+from src.agent.memory import get_checkpointer
+from src.agent.scheduler import OverloadedError
+
+
+def _fake_llms(monkeypatch, plans, synthesizer):
+    """Replace the node models: the planner replies with `plans` (as JSON) in turn."""
+    models = {"plan": FakeListChatModel(responses=[json.dumps(p) for p in plans]), "synthesize": synthesizer}
+    monkeypatch.setattr(graph, "get_node_llm", lambda node: models[node])
+
+
+def _user(content: str) -> dict:
+    return {"messages": [{"type": "human", "content": content}]}
+
+
+def test_shed_synthesis_answers_with_hold_message(monkeypatch):
+    def shed(_):
+        raise OverloadedError("openai-chat: queue full")
+
+    _fake_llms(monkeypatch, [{"steps": ["DRAFT_ANSWER"]}], RunnableLambda(shed))
+    app = graph.build_graph(MemorySaver())
+
+    out = app.invoke(_user("What is my deductible?"), {"configurable": {"thread_id": "shed"}})
+
+    assert out["answer"] == graph.OVERLOADED_ANSWER
+
+
+def _recording_synthesizer(prompts: list):
+    """Synthesizer that records each rendered prompt and answers with a fixed text."""
+    return RunnableLambda(lambda prompt: prompts.append(prompt.to_string()) or "Here is your answer.")
+
+
+def test_plan_clears_previous_turn_results(monkeypatch, tmp_path):
+    doc = type("Doc", (), {"page_content": "Deductible is $500.", "metadata": {"source": "faq.md"}})()
+    monkeypatch.setattr(graph, "load_faiss_retriever",
+                        lambda *args, **kwargs: type("Retriever", (), {"get_relevant_documents": lambda self, q: [doc]})())
+    prompts: list = []
+    _fake_llms(monkeypatch, [{"steps": ["RETRIEVE_KNOWLEDGE", "DRAFT_ANSWER"]}, {"steps": ["DRAFT_ANSWER"]}],
+               _recording_synthesizer(prompts))
+    app = graph.build_graph(get_checkpointer(tmp_path / "state.db"))
+    config = {"configurable": {"thread_id": "caller-1"}}
+
+    first = app.invoke(_user("What is my deductible?"), config)
+    second = app.invoke(_user("Thanks, that's all."), config)
+
+    assert first["retrieved"] == [{"content": "Deductible is $500.", "source": "faq.md"}]
+    assert second["retrieved"] == [] and second["mcp"] == {}
+    assert "Deductible is $500." not in prompts[1]
+
+
+@pytest.mark.parametrize("approved", [True, False])
+def test_confirmation_pauses_until_resumed(monkeypatch, tmp_path, approved):
+    prompts: list = []
+    _fake_llms(monkeypatch, [{"steps": ["HUMAN_CONFIRM", "DRAFT_ANSWER"]}], _recording_synthesizer(prompts))
+    checkpointer = get_checkpointer(tmp_path / "state.db")
+    app = graph.build_graph(checkpointer)
+    config = {"configurable": {"thread_id": "caller-2"}}
+
+    paused = app.invoke(_user("Please cancel my policy."), config)
+
+    assert not paused.get("answer") and prompts == []
+    payload = graph.pending_confirmation(app, config)
+    assert payload is not None and payload["plan"]["steps"][0] == "HUMAN_CONFIRM"
+    assert graph.list_pending_confirmations(app, checkpointer) == {"caller-2": payload}
+
+    out = graph.resume_confirmation(app, config, approved)
+
+    assert out["confirmed"] is approved
+    assert out["answer"] == "Here is your answer."
+    assert ("supervisor declined" in prompts[0]) is not approved
+    assert graph.pending_confirmation(app, config) is None
+    assert graph.list_pending_confirmations(app, checkpointer) == {}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.agent import hedge, scheduler
+from src.agent.hedge import LatencyTracker, hedged_call
+from src.config.settings import Settings
+from src.eval.llm_stub import StubConfig, serve
+from src.eval.metrics import percentile
+
+
+@pytest.fixture
+def stub():
+    """Local OpenAI-compatible stub: 10ms responses, 3% of them slowed to 400ms."""
+    config = StubConfig(base_delay=0.01, slow_rate=0.03, slow_delay=0.4, seed=7)
+    server = serve("127.0.0.1", 0, config)
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1", config
+    server.shutdown()
+    server.server_close()
+
+
+def _latencies(call, n: int = 200) -> list[float]:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def test_hedged_call_cuts_tail_latency(stub):
+    base_url, _ = stub
+    with httpx.Client() as client:
+        def request():
+            return client.post(f"{base_url}/chat/completions", json={"messages": [{"role": "user", "content": "hi"}]}).json()
+
+        plain = _latencies(request)
+        tracker = LatencyTracker(min_samples=10)
+        hedged = _latencies(lambda: hedged_call(lambda on_start: (on_start(), request())[1], request,
+                                                tracker, min_delay=0.03))
+
+    assert percentile(plain, 99) > 0.35
+    assert percentile(hedged, 99) < 0.2
+    # Only the primary's latency is tracked, so the hedge delay stays near the true p95.
+    assert tracker.p95() is not None and tracker.p95() < 0.4
+
+
+def test_hedged_call_skips_duplicate_without_capacity():
+    tracker = LatencyTracker(min_samples=1)
+    calls = []
+
+    def primary(on_start):
+        on_start()
+        time.sleep(0.05)
+        calls.append("primary")
+        return "primary"
+
+    def duplicate():
+        calls.append("duplicate-refused")
+        raise scheduler.OverloadedError("no spare capacity")
+
+    assert hedged_call(primary, duplicate, tracker, min_delay=0.01) == "primary"
+    assert calls == ["duplicate-refused", "primary"]
+
+
+def test_node_llm_reuses_pooled_connections_and_hedges(stub, monkeypatch):
+    pytest.importorskip("langchain_openai")
+    from src.agent import llm
+
+    base_url, config = stub
+    settings = Settings(openai_api_key="test", openai_base_url=base_url, llm_hedge_enabled=True,
+                        llm_hedge_min_delay=0.03, llm_hedge_min_samples=10, llm_rate_limit=0,
+                        llm_max_retries=0)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    for module in (llm, hedge, scheduler):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(llm, "_models", {})
+    monkeypatch.setattr(llm, "_trackers", {})
+    monkeypatch.setattr(scheduler, "_lanes", {})
+
+    assert llm.get_chat_model() is llm.get_chat_model()
+    model = llm.get_node_llm("synthesize")
+    samples = _latencies(lambda: model.invoke("hello"))
+
+    assert config.requests >= len(samples)
+    # Sequential calls share keep-alive connections; hedges add at most a few more.
+    assert config.connections <= 4
+    assert percentile(samples, 99) < 0.3
+
+
+def test_hedged_calls_never_queue_outside_the_lane(monkeypatch):
+    settings = Settings(llm_hedge_pool_size=1)
+    monkeypatch.setattr(hedge, "get_settings", lambda: settings)
+    monkeypatch.setattr(hedge, "_pool", None)
+    monkeypatch.setattr(hedge, "_slots", None)
+    lane = scheduler.ProviderLane("test", rate=0, burst=1, max_concurrency=1, max_queue=10, max_wait=0.5)
+    tracker = LatencyTracker()
+    outcomes: list[str] = []
+
+    def call() -> None:
+        work = lambda: time.sleep(0.3)  # noqa: E731
+        try:
+            hedged_call(lambda on_start: lane.run(work, on_admit=on_start), lambda: lane.try_run(work),
+                        tracker, min_delay=1.0)
+            outcomes.append("ok")
+        except scheduler.OverloadedError:
+            outcomes.append("shed")
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    # With one hedge worker the other callers wait in the lane, where max_wait sheds them.
+    assert len(outcomes) == 6
+    assert "shed" in outcomes
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from src.mcp.load_mongo import iter_records
+
+
+def test_csv_keeps_identifiers_as_strings(tmp_path):
+    path = tmp_path / "customers.csv"
+    path.write_text("phone,policy_number,name,age,premium,note\n"
+                    "5551234,1001,Ann,42,99.5,nan\n", encoding="utf-8")
+
+    [record] = list(iter_records(path))
+
+    # Identifiers match across collections only if every collection stores them as strings.
+    assert record["phone"] == "5551234"
+    assert record["policy_number"] == "1001"
+    assert record["age"] == 42 and record["premium"] == 99.5
+    assert record["note"] == "nan"
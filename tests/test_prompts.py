@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+
+from src.agent.prompts import PROMPTS, PromptRegistry
+
+
+def test_registry_caches_until_the_file_changes(tmp_path):
+    path = tmp_path / "planner.txt"
+    path.write_text("You plan calls.", encoding="utf-8")
+    registry = PromptRegistry(tmp_path, {"planner": ("planner.txt", PROMPTS["planner"][1])})
+
+    first = registry.get("planner")
+    assert registry.get("planner") is first
+
+    path.write_text("You plan calls carefully.", encoding="utf-8")
+    # Filesystems with coarse mtimes could leave the timestamp unchanged; move it forward explicitly.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = registry.get("planner")
+    assert reloaded is not first
+    assert "You plan calls carefully." in reloaded.format(caller="{}", history="", query="hi")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.agent.scheduler import OverloadedError, Priority, ProviderLane, priority_scope
+
+
+def _wait_for_queue(lane: ProviderLane, depth: int) -> None:
+    deadline = time.monotonic() + 2
+    while len(lane._queue) < depth:
+        assert time.monotonic() < deadline, "call never queued"
+        time.sleep(0.005)
+
+
+def test_admission_order_follows_priority_not_arrival():
+    lane = ProviderLane("test", rate=0, burst=1, max_concurrency=1, max_queue=10, max_wait=5)
+    release = threading.Event()
+    order: list[str] = []
+
+    holder = threading.Thread(target=lambda: lane.run(release.wait, Priority.LIVE))
+    holder.start()
+    while lane.stats["admitted"] < 1:
+        time.sleep(0.005)
+
+    def call(tag: str, priority: Priority, background: bool = False) -> None:
+        if background:
+            with priority_scope(Priority.BACKGROUND):
+                lane.run(lambda: order.append(tag), priority)
+        else:
+            lane.run(lambda: order.append(tag), priority)
+
+    threads = []
+    for depth, args in enumerate([("live", Priority.LIVE), ("eval", Priority.SYNTHESIS, True),
+                                  ("synthesis", Priority.SYNTHESIS)], start=1):
+        t = threading.Thread(target=call, args=args)
+        t.start()
+        threads.append(t)
+        _wait_for_queue(lane, depth)
+
+    release.set()
+    for t in [holder, *threads]:
+        t.join(timeout=2)
+    assert order == ["synthesis", "live", "eval"]
+
+
+def test_background_is_shed_first_and_never_with_queue_of_one():
+    lane = ProviderLane("test", rate=0, burst=1, max_concurrency=1, max_queue=1, max_wait=5)
+    assert lane._queue_limit(Priority.BACKGROUND) == 1
+    assert lane.run(lambda: "ok", Priority.BACKGROUND) == "ok"
+
+    lane = ProviderLane("test", rate=0, burst=1, max_concurrency=1, max_queue=4, max_wait=5)
+    release = threading.Event()
+    holder = threading.Thread(target=lambda: lane.run(release.wait))
+    holder.start()
+    while lane.stats["admitted"] < 1:
+        time.sleep(0.005)
+    waiters = [threading.Thread(target=lane.run, args=(lambda: None,)) for _ in range(2)]
+    for depth, t in enumerate(waiters, start=1):
+        t.start()
+        _wait_for_queue(lane, depth)
+
+    with pytest.raises(OverloadedError):
+        lane.run(lambda: None, Priority.BACKGROUND)
+    release.set()
+    for t in [holder, *waiters]:
+        t.join(timeout=2)
+    assert lane.stats["shed"] == 1
+
+
+def test_scheduled_embeddings_admit_each_batch(monkeypatch):
+    pytest.importorskip("langchain_community")
+    from langchain_core.embeddings import FakeEmbeddings
+
+    from src.tools import retriever
+
+    lane = ProviderLane("test-embeddings", rate=0, burst=1, max_concurrency=1, max_queue=10, max_wait=5)
+    monkeypatch.setattr(retriever, "get_lane", lambda provider: lane)
+    embeddings = retriever.ScheduledEmbeddings(FakeEmbeddings(size=4), batch_size=2)
+
+    assert len(embeddings.embed_documents([f"chunk {i}" for i in range(5)])) == 5
+    assert lane.stats["admitted"] == 3
+    embeddings.embed_query("deductible")
+    assert lane.stats["admitted"] == 4